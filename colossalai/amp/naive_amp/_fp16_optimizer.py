@@ -316,17 +316,21 @@ class FP16Optimizer(Optimizer):
         for model_group, main_group in zip(self.float16_groups,
                                            self.fp32_from_float16_groups):
             for model_param, main_param in zip(model_group, main_group):
-                if self.params_have_main_grad:
+                # params that received no gradient (e.g. the unused bias replicas
+                # of 2.5D layers) have no main grad either
+                if self.params_have_main_grad and hasattr(model_param, 'main_grad'):
                     main_param.grad = model_param.main_grad.float()
+                elif model_param.grad is not None:
+                    main_param.grad = model_param.grad.float()
                 else:
-                    if model_param.grad is not None:
-                        main_param.grad = model_param.grad.float()
+                    main_param.grad = None
 
         # For fp32 grads, we need to reset the grads to main grad.
         if self.params_have_main_grad:
             for model_group in self.fp32_from_fp32_groups:
                 for model_param in model_group:
-                    model_param.grad = model_param.main_grad
+                    if hasattr(model_param, 'main_grad'):
+                        model_param.grad = model_param.main_grad
 
     def _unscale_main_grads_and_check_for_nan(self):
         main_grads = []
@@ -33,6 +33,9 @@ class DataParallelGradientHandler(BaseGradientHandler):
                         buckets[tp] = []
                     buckets[tp].append(param)
                     param.main_grad = param.grad
+                elif hasattr(param, 'main_grad'):
+                    # do not leave the main grad of an earlier step behind
+                    del param.main_grad
 
             # For each bucket, all-reduce and copy all-reduced grads.
             for tp in buckets:
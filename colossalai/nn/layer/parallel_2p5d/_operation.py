@@ -22,6 +22,60 @@ def get_parallel_rank(parallel_mode: ParallelMode):
     return gpc.get_local_rank(parallel_mode)
 
 
+def _all_gather_into_tensor(output: Tensor, input_: Tensor, group, async_op: bool = False):
+    # gathers ``input_`` from every rank of ``group`` into the contiguous ``output``
+    # buffer, rank ``r`` occupying the ``r``-th slice along dim 0
+    if hasattr(dist, 'all_gather_into_tensor'):  # pytorch 1.13+
+        return dist.all_gather_into_tensor(output, input_, group=group, async_op=async_op)
+    if hasattr(dist, '_all_gather_base'):
+        return dist._all_gather_base(output, input_, group=group, async_op=async_op)
+    world_size = dist.get_world_size(group)
+    output_list = list(output.view((world_size,) + input_.shape).unbind(0))
+    return dist.all_gather(output_list, input_, group=group, async_op=async_op)
+
+
+def _reduce_scatter_tensor(output: Tensor, input_: Tensor, group, async_op: bool = False):
+    # sums ``input_`` over ``group`` and scatters it along dim 0, rank ``r``
+    # receiving the ``r``-th slice in ``output``
+    if hasattr(dist, 'reduce_scatter_tensor'):  # pytorch 1.13+
+        return dist.reduce_scatter_tensor(output, input_, group=group, async_op=async_op)
+    if hasattr(dist, '_reduce_scatter_base'):
+        return dist._reduce_scatter_base(output, input_, group=group, async_op=async_op)
+    world_size = dist.get_world_size(group)
+    input_list = list(input_.view((world_size,) + output.shape).unbind(0))
+    return dist.reduce_scatter(output, input_list, group=group, async_op=async_op)
+
+
+def _cannon_schedule(x: int, y: int, tesseract_dim: int):
+    # peers of rank (x, y) in Cannon's algorithm, as positions in the row group
+    # (for A) and in the column group (for B): ((dst_a, dst_b), (src_a, src_b))
+    # for the initial skew and for every following ring step
+    skew = (((y - x) % tesseract_dim, (x - y) % tesseract_dim),
+            ((y + x) % tesseract_dim, (x + y) % tesseract_dim))
+    ring = (((y - 1) % tesseract_dim, (x - 1) % tesseract_dim),
+            ((y + 1) % tesseract_dim, (x + 1) % tesseract_dim))
+    return skew, ring
+
+
+def _shift_tensors(rank, tensors, buffers, dst_ranks, src_ranks, groups):
+    # sends every tensor to its dst rank while receiving the matching buffer from
+    # its src rank; a tensor whose dst is the current global rank stays where it is.
+    # Each transfer runs on its own group, which must contain both peers, and
+    # every group gets its own batch since one batch has to share a single group
+    reqs = []
+    outputs = []
+    for tensor, buffer, dst, src, group in zip(tensors, buffers, dst_ranks, src_ranks, groups):
+        if dst == rank:
+            outputs.append(tensor)
+        else:
+            reqs.extend(dist.batch_isend_irecv([
+                dist.P2POp(dist.isend, tensor, dst, group=group),
+                dist.P2POp(dist.irecv, buffer, src, group=group)
+            ]))
+            outputs.append(buffer)
+    return outputs, reqs
+
+
 class Matmul_AB_2p5D(torch.autograd.Function):
     """Matrix multiplication for :math:`C = AB`
     """
@@ -50,33 +104,57 @@ class Matmul_AB_2p5D(torch.autograd.Function):
             'Invalid shapes: A={}, B={} for AB.'.format(A.shape, B.shape)
 
         if ctx:
-            ctx.save_for_backward(A, B)
+            # A is only needed for the gradient of B and vice versa
+            ctx.save_for_backward(A if ctx.needs_input_grad[1] else None,
+                                  B if ctx.needs_input_grad[0] else None)
 
         A_shape = A.shape
         A = A.reshape((-1, A_shape[-1])).contiguous()
         B_shape = B.shape
         B = B.reshape((-1, B_shape[-1])).contiguous()
         C_shape = (A.shape[0], B.shape[-1])
-        C = torch.zeros(C_shape, dtype=A.dtype, device=get_current_device())
-
-        A_list = [torch.empty_like(A) for _ in range(gpc.get_world_size(row_parallel_mode)-1)]
-        B_list = [torch.empty_like(B) for _ in range(gpc.get_world_size(col_parallel_mode)-1)]
-        A_list.insert(gpc.get_local_rank(row_parallel_mode), A)
-        B_list.insert(gpc.get_local_rank(col_parallel_mode), B)
-        op_a = dist.all_gather(A_list, A, group=gpc.get_group(row_parallel_mode), async_op=True)
-        op_a.wait()
-        op_b = dist.all_gather(B_list, B, group=gpc.get_group(col_parallel_mode), async_op=True)
-        for op in [op_a, op_b]:
-            op.wait()
+        C = torch.empty(C_shape, dtype=A.dtype, device=get_current_device())
+
+        # Cannon's algorithm on the [q, q] layer of the tesseract: rank (x, y) holds
+        # A[x, y] and B[x, y]; after skewing row x of A by x and column y of B by y,
+        # each step multiplies a matching pair A[x, k] @ B[k, y] while the next pair
+        # rotates in along the row / column ring
+        row_ranks = gpc.get_ranks_in_group(row_parallel_mode)
+        col_ranks = gpc.get_ranks_in_group(col_parallel_mode)
+        x = gpc.get_local_rank(col_parallel_mode)
+        y = gpc.get_local_rank(row_parallel_mode)
+        global_rank = gpc.get_global_rank()
+        # A moves along the row group and B along the column group rather than on
+        # WORLD, so every rank of a group enters its P2P batches together: the A
+        # skew is skipped by the whole row group with x == 0 and the B skew by the
+        # whole column group with y == 0
+        groups = [get_parallel_group(row_parallel_mode), get_parallel_group(col_parallel_mode)]
+        (skew_dst, skew_src), (ring_dst, ring_src) = _cannon_schedule(x, y, tesseract_dim)
+        skew_dst = [row_ranks[skew_dst[0]], col_ranks[skew_dst[1]]]
+        skew_src = [row_ranks[skew_src[0]], col_ranks[skew_src[1]]]
+        ring_dst = [row_ranks[ring_dst[0]], col_ranks[ring_dst[1]]]
+        ring_src = [row_ranks[ring_src[0]], col_ranks[ring_src[1]]]
+        A_buffers = [torch.empty_like(A), torch.empty_like(A)]
+        B_buffers = [torch.empty_like(B), torch.empty_like(B)]
+
+        (A_temp, B_temp), reqs = _shift_tensors(
+            global_rank, [A, B], [A_buffers[0], B_buffers[0]], skew_dst, skew_src, groups)
+        for req in reqs:
+            req.wait()
 
         for i in range(tesseract_dim):
-            src_a = i + tesseract_dim * row_rank
-            src_b = i + tesseract_dim * col_rank
-            src_a = src_a % tesseract_dim
-            src_b = src_b % tesseract_dim
-            A_temp = A_list[src_a]
-            B_temp = B_list[src_b]
-            torch.addmm(C, A_temp, B_temp, out=C)
+            if i < tesseract_dim - 1:
+                (A_next, B_next), reqs = _shift_tensors(
+                    global_rank, [A_temp, B_temp], [A_buffers[(i + 1) % 2], B_buffers[(i + 1) % 2]],
+                    ring_dst, ring_src, groups)
+            if i == 0:
+                torch.mm(A_temp, B_temp, out=C)
+            else:
+                torch.addmm(C, A_temp, B_temp, out=C)
+            if i < tesseract_dim - 1:
+                for req in reqs:
+                    req.wait()
+                A_temp, B_temp = A_next, B_next
         out = C.reshape(out_shape)
 
         if ctx:
@@ -99,29 +177,32 @@ class Matmul_AB_2p5D(torch.autograd.Function):
     @custom_bwd
     def backward(ctx: Any, output_grad: Tensor) -> Tuple[Tensor, ...]:
         A, B = ctx.saved_tensors
+        A_grad = B_grad = None
         with torch.no_grad():
-            A_grad = Matmul_ABT_2p5D.apply(
-                output_grad, B,
-                ctx.tesseract_dim, ctx.A_shape,
-                ctx.row_rank, ctx.col_rank, ctx.dep_rank,
-                ctx.row_parallel_mode,
-                ctx.col_parallel_mode,
-                ctx.data_parallel_rank,
-                ctx.pipeline_parallel_rank,
-                ctx.pipeline_parallel_size,
-                ctx.tensor_parallel_size
-            )
-            B_grad = Matmul_ATB_2p5D.apply(
-                A, output_grad,
-                ctx.tesseract_dim, ctx.B_shape,
-                ctx.row_rank, ctx.col_rank, ctx.dep_rank,
-                ctx.row_parallel_mode,
-                ctx.col_parallel_mode,
-                ctx.data_parallel_rank,
-                ctx.pipeline_parallel_rank,
-                ctx.pipeline_parallel_size,
-                ctx.tensor_parallel_size
-            )
+            if ctx.needs_input_grad[0]:
+                A_grad = Matmul_ABT_2p5D.apply(
+                    output_grad, B,
+                    ctx.tesseract_dim, ctx.A_shape,
+                    ctx.row_rank, ctx.col_rank, ctx.dep_rank,
+                    ctx.row_parallel_mode,
+                    ctx.col_parallel_mode,
+                    ctx.data_parallel_rank,
+                    ctx.pipeline_parallel_rank,
+                    ctx.pipeline_parallel_size,
+                    ctx.tensor_parallel_size
+                )
+            if ctx.needs_input_grad[1]:
+                B_grad = Matmul_ATB_2p5D.apply(
+                    A, output_grad,
+                    ctx.tesseract_dim, ctx.B_shape,
+                    ctx.row_rank, ctx.col_rank, ctx.dep_rank,
+                    ctx.row_parallel_mode,
+                    ctx.col_parallel_mode,
+                    ctx.data_parallel_rank,
+                    ctx.pipeline_parallel_rank,
+                    ctx.pipeline_parallel_size,
+                    ctx.tensor_parallel_size
+                )
         return A_grad, B_grad, None, None, None, None, None, None, None, None, None, None, None, None, None
 
 
@@ -151,28 +232,42 @@ class Matmul_ABT_2p5D(torch.autograd.Function):
             'Invalid shapes: A={}, B={} for ABT.'.format(A.shape, B.shape)
 
         if ctx:
-            ctx.save_for_backward(A, B)
+            ctx.save_for_backward(A if ctx.needs_input_grad[1] else None,
+                                  B if ctx.needs_input_grad[0] else None)
 
         A_shape = A.shape
         A = A.reshape((-1, A_shape[-1]))
         B_shape = B.shape
-        B = B.reshape((-1, B_shape[-1]))
+        B = B.reshape((-1, B_shape[-1])).contiguous()
         C_shape = (A.shape[0], B.shape[0])
         C = torch.empty(C_shape, dtype=A.dtype, device=get_current_device())
 
+        row_group = get_parallel_group(row_parallel_mode)
+        col_group = get_parallel_group(col_parallel_mode)
+
+        # B of every rank in the column at once instead of one broadcast per step;
+        # in the backward of Linear2p5D this B is the weight shard, so the gather
+        # costs q weight shards rather than q activations. The partial products
+        # are not computed as one batched GEMM: bmm needs all of them at once in a
+        # (q, m, n) stack, and here every product is activation-sized
+        B_gather = torch.empty((tesseract_dim,) + B.shape, dtype=B.dtype, device=get_current_device())
+        _all_gather_into_tensor(B_gather, B, group=col_group)
+
+        # global rank of position (0, 0) in this layer of the tesseract
+        base_rank = dep_rank * (tesseract_dim ** 2) + \
+            data_parallel_rank * pipeline_parallel_size * tensor_parallel_size + \
+            pipeline_parallel_rank * tensor_parallel_size
+
+        # C is activation-sized here, so the partial products are reduced one step
+        # at a time rather than stacked for a reduce-scatter: the product destined
+        # for this rank is written straight into C, the others into one buffer
+        C_buffer = torch.empty_like(C)
+
         for i in range(tesseract_dim):
-            B_temp = B.clone()
-            src_b = col_rank + i * tesseract_dim + dep_rank * (
-                        tesseract_dim ** 2) + data_parallel_rank * pipeline_parallel_size * tensor_parallel_size + \
-                    pipeline_parallel_rank * tensor_parallel_size
-            dist.broadcast(B_temp, src=src_b, group=gpc.get_group(col_parallel_mode))
-            C_temp = torch.matmul(A, B_temp.transpose(0, 1))
-            src_c = i + row_rank * tesseract_dim + dep_rank * (
-                        tesseract_dim ** 2) + data_parallel_rank * pipeline_parallel_size * tensor_parallel_size + \
-                    pipeline_parallel_rank * tensor_parallel_size
-            dist.reduce(C_temp, dst=src_c, group=gpc.get_group(row_parallel_mode))
-            if i == col_rank:
-                C = C_temp.clone()
+            C_temp = C if i == col_rank else C_buffer
+            torch.matmul(A, B_gather[i].transpose(0, 1), out=C_temp)
+            src_c = i + row_rank * tesseract_dim + base_rank
+            dist.reduce(C_temp, dst=src_c, group=row_group)
 
         out = C.reshape(out_shape)
 
@@ -196,29 +291,32 @@ class Matmul_ABT_2p5D(torch.autograd.Function):
     @custom_bwd
     def backward(ctx: Any, output_grad: Tensor) -> Tuple[Tensor, ...]:
         A, B = ctx.saved_tensors
+        A_grad = B_grad = None
         with torch.no_grad():
-            A_grad = Matmul_AB_2p5D.apply(
-                output_grad, B,
-                ctx.tesseract_dim, ctx.A_shape,
-                ctx.row_rank, ctx.col_rank, ctx.dep_rank,
-                ctx.row_parallel_mode,
-                ctx.col_parallel_mode,
-                ctx.data_parallel_rank,
-                ctx.pipeline_parallel_rank,
-                ctx.pipeline_parallel_size,
-                ctx.tensor_parallel_size
-            )
-            B_grad = Matmul_ATB_2p5D.apply(
-                output_grad, A,
-                ctx.tesseract_dim, ctx.B_shape,
-                ctx.row_rank, ctx.col_rank, ctx.dep_rank,
-                ctx.row_parallel_mode,
-                ctx.col_parallel_mode,
-                ctx.data_parallel_rank,
-                ctx.pipeline_parallel_rank,
-                ctx.pipeline_parallel_size,
-                ctx.tensor_parallel_size
-            )
+            if ctx.needs_input_grad[0]:
+                A_grad = Matmul_AB_2p5D.apply(
+                    output_grad, B,
+                    ctx.tesseract_dim, ctx.A_shape,
+                    ctx.row_rank, ctx.col_rank, ctx.dep_rank,
+                    ctx.row_parallel_mode,
+                    ctx.col_parallel_mode,
+                    ctx.data_parallel_rank,
+                    ctx.pipeline_parallel_rank,
+                    ctx.pipeline_parallel_size,
+                    ctx.tensor_parallel_size
+                )
+            if ctx.needs_input_grad[1]:
+                B_grad = Matmul_ATB_2p5D.apply(
+                    output_grad, A,
+                    ctx.tesseract_dim, ctx.B_shape,
+                    ctx.row_rank, ctx.col_rank, ctx.dep_rank,
+                    ctx.row_parallel_mode,
+                    ctx.col_parallel_mode,
+                    ctx.data_parallel_rank,
+                    ctx.pipeline_parallel_rank,
+                    ctx.pipeline_parallel_size,
+                    ctx.tensor_parallel_size
+                )
         return A_grad, B_grad, None, None, None, None, None, None, None, None, None, None, None, None, None
 
 
@@ -247,30 +345,37 @@ class Matmul_ATB_2p5D(torch.autograd.Function):
             'Invalid shapes: A={}, B={} for ATB.'.format(A.shape, B.shape)
 
         if ctx:
-            ctx.save_for_backward(A, B)
+            ctx.save_for_backward(A if ctx.needs_input_grad[1] else None,
+                                  B if ctx.needs_input_grad[0] else None)
 
         A_shape = A.shape
-        A = A.reshape((-1, A_shape[-1]))
+        A = A.reshape((-1, A_shape[-1])).contiguous()
         B_shape = B.shape
         B = B.reshape((-1, B_shape[-1]))
         C_shape = (A.shape[-1], B.shape[-1])
         C = torch.empty(C_shape, dtype=A.dtype, device=get_current_device())
 
+        row_group = get_parallel_group(row_parallel_mode)
+        col_group = get_parallel_group(col_parallel_mode)
+
+        # global rank of position (0, 0) in this layer of the tesseract
+        base_rank = dep_rank * (tesseract_dim ** 2) + \
+            data_parallel_rank * pipeline_parallel_size * tensor_parallel_size + \
+            pipeline_parallel_rank * tensor_parallel_size
+
+        # A is an activation here, so it is broadcast one step at a time rather than
+        # gathered: the source sends its own A, the others receive into one buffer
+        global_rank = gpc.get_global_rank()
+        A_buffer = torch.empty_like(A)
+        # partial products stacked by destination rank for a single reduce-scatter
+        C_stack = torch.empty((tesseract_dim,) + C_shape, dtype=A.dtype, device=get_current_device())
+
         for i in range(tesseract_dim):
-            A_temp = A.clone()
-            src_a = i + row_rank * tesseract_dim + dep_rank * (
-                        tesseract_dim ** 2) + data_parallel_rank * pipeline_parallel_size * tensor_parallel_size + \
-                    pipeline_parallel_rank * tensor_parallel_size
-            dist.broadcast(A_temp, src=src_a,
-                           group=get_parallel_group(row_parallel_mode))
-            C_temp = torch.matmul(A_temp.transpose(0, 1), B)
-            src_c = col_rank + i * tesseract_dim + dep_rank * (
-                        tesseract_dim ** 2) + data_parallel_rank * pipeline_parallel_size * tensor_parallel_size + \
-                    pipeline_parallel_rank * tensor_parallel_size
-            dist.reduce(C_temp, dst=src_c,
-                        group=get_parallel_group(col_parallel_mode))
-            if i == row_rank:
-                C = C_temp.clone()
+            src_a = i + row_rank * tesseract_dim + base_rank
+            A_temp = A if src_a == global_rank else A_buffer
+            dist.broadcast(A_temp, src=src_a, group=row_group)
+            torch.matmul(A_temp.transpose(0, 1), B, out=C_stack[i])
+        _reduce_scatter_tensor(C, C_stack, group=col_group)
 
         out = C.reshape(out_shape)
 
@@ -294,29 +399,32 @@ class Matmul_ATB_2p5D(torch.autograd.Function):
     @custom_bwd
     def backward(ctx: Any, output_grad: Tensor) -> Tuple[Tensor, ...]:
         A, B = ctx.saved_tensors
+        A_grad = B_grad = None
         with torch.no_grad():
-            A_grad = Matmul_ABT_2p5D.apply(
-                B, output_grad,
-                ctx.tesseract_dim, ctx.A_shape,
-                ctx.row_rank, ctx.col_rank, ctx.dep_rank,
-                ctx.row_parallel_mode,
-                ctx.col_parallel_mode,
-                ctx.data_parallel_rank,
-                ctx.pipeline_parallel_rank,
-                ctx.pipeline_parallel_size,
-                ctx.tensor_parallel_size
-            )
-            B_grad = Matmul_AB_2p5D.apply(
-                A, output_grad,
-                ctx.tesseract_dim, ctx.B_shape,
-                ctx.row_rank, ctx.col_rank, ctx.dep_rank,
-                ctx.row_parallel_mode,
-                ctx.col_parallel_mode,
-                ctx.data_parallel_rank,
-                ctx.pipeline_parallel_rank,
-                ctx.pipeline_parallel_size,
-                ctx.tensor_parallel_size
-            )
+            if ctx.needs_input_grad[0]:
+                A_grad = Matmul_ABT_2p5D.apply(
+                    B, output_grad,
+                    ctx.tesseract_dim, ctx.A_shape,
+                    ctx.row_rank, ctx.col_rank, ctx.dep_rank,
+                    ctx.row_parallel_mode,
+                    ctx.col_parallel_mode,
+                    ctx.data_parallel_rank,
+                    ctx.pipeline_parallel_rank,
+                    ctx.pipeline_parallel_size,
+                    ctx.tensor_parallel_size
+                )
+            if ctx.needs_input_grad[1]:
+                B_grad = Matmul_AB_2p5D.apply(
+                    A, output_grad,
+                    ctx.tesseract_dim, ctx.B_shape,
+                    ctx.row_rank, ctx.col_rank, ctx.dep_rank,
+                    ctx.row_parallel_mode,
+                    ctx.col_parallel_mode,
+                    ctx.data_parallel_rank,
+                    ctx.pipeline_parallel_rank,
+                    ctx.pipeline_parallel_size,
+                    ctx.tensor_parallel_size
+                )
         return A_grad, B_grad, None, None, None, None, None, None, None, None, None, None, None, None, None
 
 
@@ -344,7 +452,7 @@ class Add_Bias_2p5D(torch.autograd.Function):
         if row_rank == 0:
             bias_temp = bias.clone()
         else:
-            bias_temp = torch.zeros(
+            bias_temp = torch.empty(
                 output_size_per_partition,
                 dtype=bias.dtype,
                 device=get_current_device())
@@ -383,28 +491,34 @@ class Add_Bias_2p5D(torch.autograd.Function):
         pipeline_parallel_size = ctx.pipeline_parallel_size
         tensor_parallel_size = ctx.tensor_parallel_size
 
+        # the bias gradient is summed on row rank 0 only: that rank owns the whole
+        # [h / q] bias shard, so a reduce-scatter would leave it 1 / q of the sum
+        dst_rank = col_rank + dep_rank * (
+                    tesseract_dim ** 2) + data_parallel_rank * pipeline_parallel_size * tensor_parallel_size + \
+                   pipeline_parallel_rank * tensor_parallel_size
+        col_group = get_parallel_group(col_parallel_mode)
+
         if ctx.bias:
-            dst_rank = col_rank + dep_rank * (
-                        tesseract_dim ** 2) + data_parallel_rank * pipeline_parallel_size * tensor_parallel_size + \
-                       pipeline_parallel_rank * tensor_parallel_size
-            dist.reduce(output_grad, dst=dst_rank, group=get_parallel_group(col_parallel_mode))
+            dist.reduce(output_grad, dst=dst_rank, group=col_group)
+            # only the bias on row rank 0 is used, the other copies get no gradient
             if row_rank == 0:
                 return None, output_grad, None, None, None, None, None, None, None, None, None, None, None, None, None, None
             else:
-                grad_tmp = torch.zeros_like(output_grad)
-                return None, grad_tmp, None, None, None, None, None, None, None, None, None, None, None, None, None, None
+                return None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None
         else:
             reduce_dim = tuple(range(output_grad.ndim - 1))
             reduce = torch.sum(output_grad, dim=reduce_dim)
-            dst_rank = col_rank + dep_rank * (
-                        tesseract_dim ** 2) + data_parallel_rank * pipeline_parallel_size * tensor_parallel_size + \
-                       pipeline_parallel_rank * tensor_parallel_size
-            dist.reduce(reduce, dst=dst_rank, group=get_parallel_group(col_parallel_mode))
+            dist.reduce(reduce, dst=dst_rank, group=col_group)
             if row_rank == 0:
                 return output_grad, reduce, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None
             else:
-                reduce_tmp = torch.zeros_like(reduce)
-                return output_grad, reduce_tmp, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None
+                return output_grad, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None
+
+
+@torch.jit.script
+def _layernorm_2p5d_input_grad(output_grad, x, Var_x, output_grad_sum, output_grad_mul_x_sum):
+    # fused into a single elementwise pass over output_grad and x
+    return (output_grad - x * output_grad_mul_x_sum - output_grad_sum) * Var_x
 
 
 class _LayerNorm_2p5D(torch.autograd.Function):
@@ -431,21 +545,25 @@ class _LayerNorm_2p5D(torch.autograd.Function):
         x, Var_x = ctx.saved_tensors
         # in here, Var_x = 1 / sqrt(Var[x] + eps), x = (x - E[x]) * Var_x
         with torch.no_grad():
+            # the all-reduce of the first sum is in flight while the second sum is
+            # computed, leaving only the last all-reduce on the critical path
+            row_group = get_parallel_group(row_parallel_mode)
             output_grad_sum = torch.sum(output_grad, dim=-1, keepdim=True)
-            torch.distributed.all_reduce(
-                output_grad_sum, group=get_parallel_group(row_parallel_mode))
-            output_grad_sum /= ctx.hidden_size
+            op_sum = torch.distributed.all_reduce(
+                output_grad_sum, group=row_group, async_op=True)
 
             output_grad_mul_x_sum = torch.sum(
                 output_grad * x, dim=-1, keepdim=True)
-            torch.distributed.all_reduce(
-                output_grad_mul_x_sum, group=get_parallel_group(row_parallel_mode))
+            op_mul_x_sum = torch.distributed.all_reduce(
+                output_grad_mul_x_sum, group=row_group, async_op=True)
+
+            for op in [op_sum, op_mul_x_sum]:
+                op.wait()
+            output_grad_sum /= ctx.hidden_size
             output_grad_mul_x_sum /= ctx.hidden_size
 
-            input_grad = output_grad.clone()
-            input_grad -= x * output_grad_mul_x_sum
-            input_grad -= output_grad_sum
-            input_grad *= Var_x
+            input_grad = _layernorm_2p5d_input_grad(
+                output_grad, x, Var_x, output_grad_sum, output_grad_mul_x_sum)
 
         return input_grad, None, None, None, None, None, None
 
@@ -518,27 +636,37 @@ class AllGatherLast(torch.autograd.Function):
     def forward(ctx: Any,
                 inputs: Tensor,
                 tesseract_dim: int,
-                col_parallel_mode: ParallelMode) -> Tensor:
+                col_parallel_mode: ParallelMode,
+                merge_last: bool = True) -> Tensor:
         ctx.tesseract_dim = tesseract_dim
         ctx.row_rank = gpc.get_local_rank(col_parallel_mode)
+        ctx.merge_last = merge_last
 
         last_dim = tesseract_dim * inputs.size(-1)
-        outputs_shape = (last_dim,) + inputs.shape[:-1]
+        # gather along a new leading dim: [q, b, s, h / q]
+        outputs_shape = (tesseract_dim,) + inputs.shape
         outputs = torch.empty(
             outputs_shape, dtype=inputs.dtype, device=get_current_device())
-        dist.all_gather(
-            list(outputs.chunk(tesseract_dim, dim=0)),
-            inputs.permute(2, 0, 1).contiguous(),
+        _all_gather_into_tensor(
+            outputs,
+            inputs.contiguous(),
             group=gpc.get_group(col_parallel_mode)
         )
-        outputs = outputs.permute(1, 2, 0).contiguous()
+        # [b, s, q, h / q] view of the gathered buffer; merging the last two dims
+        # costs a copy, so callers that can work on the view may skip it
+        outputs = outputs.movedim(0, -2)
+        if merge_last:
+            outputs = outputs.reshape(inputs.shape[:-1] + (last_dim,))
         return outputs
 
     @staticmethod
     @custom_bwd
     def backward(ctx: Any, output_grad: Tensor) -> Tuple[Tensor, ...]:
-        grad = output_grad.chunk(ctx.tesseract_dim, dim=-1)[ctx.row_rank]
-        return grad.contiguous(), None, None
+        if ctx.merge_last:
+            grad = output_grad.chunk(ctx.tesseract_dim, dim=-1)[ctx.row_rank]
+        else:
+            grad = output_grad.select(-2, ctx.row_rank)
+        return grad.contiguous(), None, None, None
 
 
 class SplitFirst(torch.autograd.Function):
@@ -563,8 +691,8 @@ class SplitFirst(torch.autograd.Function):
         grad_shape = (ctx.batch_size,) + output_grad.shape[1:]
         grad = torch.empty(
             grad_shape, dtype=output_grad.dtype, device=get_current_device())
-        dist.all_gather(
-            list(grad.chunk(ctx.tesseract_dim, dim=0)),
+        _all_gather_into_tensor(
+            grad,
             output_grad.contiguous(),
             group=gpc.get_group(ctx.para_mode)
         )
@@ -74,8 +74,6 @@ class ViTMLP2p5D(ParallelLayer):
             skip_bias_add=skip_dense_1_add_bias
         )
 
-        self.act = ACT2FN[act_func]
-
         # Project back to h.
         self.dense_2 = Linear2p5D(
             self.mlp_ratio * self.in_features,
@@ -334,11 +332,13 @@ class ViTInputSplitter2p5D(ParallelLayer):
         self.tesseract_dim, _ = get_tesseract_dim_dep_from_env()
 
     def forward(self, x: Tensor) -> Tensor:
+        # split the [b, s, q, h / q] view first so that only the local batch
+        # chunk is laid out as [b / q, s, h]
         x = AllGatherLast.apply(
-            x, self.tesseract_dim, ParallelMode.PARALLEL_2P5D_COL)
+            x, self.tesseract_dim, ParallelMode.PARALLEL_2P5D_COL, False)
         x = SplitFirst.apply(
             x, self.tesseract_dim, ParallelMode.PARALLEL_2P5D_COL)
-        return x
+        return x.flatten(-2)
 
 
 @LAYERS.register_module
@@ -413,9 +413,10 @@ class ViTTokenFuser2p5D(ParallelLayer):
         cls_token = cls_token.expand(x.shape[0], -1, -1)
         x = torch.cat((cls_token, x), dim=1)
 
+        # add the [1, n, q, h / q] view directly instead of laying it out as [1, n, h]
         pos_embed = AllGatherLast.apply(
-            self.pos_embed, self.tesseract_dim, ParallelMode.PARALLEL_2P5D_COL)
-        x = x + pos_embed
+            self.pos_embed, self.tesseract_dim, ParallelMode.PARALLEL_2P5D_COL, False)
+        x = (x.view(x.shape[:-1] + pos_embed.shape[-2:]) + pos_embed).flatten(-2)
         with seed(ParallelMode.TENSOR):
             x = self.pos_drop(x)
         return x
@@ -0,0 +1,95 @@
+import colossalai
+import pytest
+import torch
+import torch.nn as nn
+import torch.multiprocessing as mp
+
+from colossalai.amp.naive_amp._fp16_optimizer import FP16Optimizer
+from colossalai.core import global_context as gpc
+from colossalai.engine.gradient_handler import DataParallelGradientHandler
+from functools import partial
+
+
+CONFIG = dict(
+    parallel=dict(
+        pipeline=dict(size=1),
+        tensor=dict(size=1, mode=None)
+    )
+)
+
+
+class PartiallyUsedModel(nn.Module):
+
+    def __init__(self):
+        super().__init__()
+        self.always = nn.Linear(4, 4)
+        self.sometimes = nn.Linear(4, 4)
+        self.never = nn.Linear(4, 4)
+
+    def forward(self, x, use_sometimes):
+        x = self.always(x)
+        if use_sometimes:
+            x = self.sometimes(x)
+        return x
+
+
+def get_main_param(optimizer, param):
+    for model_group, main_group in zip(optimizer.float16_groups, optimizer.fp32_from_float16_groups):
+        for model_param, main_param in zip(model_group, main_group):
+            if model_param is param:
+                return main_param
+
+
+def run_missing_grad(rank, world_size):
+    colossalai.launch(
+        config=CONFIG,
+        rank=rank,
+        world_size=world_size,
+        host='localhost',
+        port=29914,
+        backend='nccl'
+    )
+    assert gpc.data_parallel_size == world_size
+
+    model = PartiallyUsedModel().cuda().half()
+    optimizer = FP16Optimizer(torch.optim.SGD(model.parameters(), lr=1e-2), initial_scale=2 ** 5)
+    gradient_handler = DataParallelGradientHandler(model, optimizer)
+    params = dict(always=model.always.weight,
+                  sometimes=model.sometimes.weight,
+                  never=model.never.weight)
+    main_params = {name: get_main_param(optimizer, param) for name, param in params.items()}
+
+    # the first step updates ``sometimes``, the second leaves it without a gradient
+    for use_sometimes in (True, False):
+        old_params = {name: param.detach().clone() for name, param in params.items()}
+        optimizer.zero_grad(set_to_none=True)
+        x = torch.randn((8, 4), dtype=torch.half, device='cuda')
+        optimizer.scale_loss(model(x, use_sometimes).float().sum()).backward()
+        has_grad = dict(always=True, sometimes=use_sometimes, never=False)
+
+        gradient_handler.handle_gradient()
+        for name, param in params.items():
+            # a main_grad left over from the first step must not outlive the grad
+            assert hasattr(param, 'main_grad') == has_grad[name]
+
+        optimizer._copy_model_grads_to_main_grads()
+        for name, main_param in main_params.items():
+            assert (main_param.grad is not None) == has_grad[name]
+
+        optimizer.step()
+        for name, param in params.items():
+            assert torch.equal(old_params[name], param) != has_grad[name]
+
+    gpc.destroy()
+    torch.cuda.empty_cache()
+
+
+@pytest.mark.dist
+def test_naive_amp_missing_grad():
+    world_size = 2
+    run_func = partial(run_missing_grad, world_size=world_size)
+    mp.spawn(run_func, nprocs=world_size)
+
+
+if __name__ == '__main__':
+    test_naive_amp_missing_grad()
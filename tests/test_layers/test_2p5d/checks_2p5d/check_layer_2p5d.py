@@ -1,9 +1,10 @@
 from torch.nn import Parameter
 
+from colossalai.amp.naive_amp._fp16_optimizer import FP16Optimizer
 from colossalai.context.parallel_mode import ParallelMode
 from colossalai.core import global_context as gpc
 from colossalai.nn import (Linear2p5D, LayerNorm2p5D, TransformerSelfAttention2p5D, TransformerMLP2p5D,
-                           TransformerLayer2p5D)
+                           TransformerLayer2p5D, ViTMLP2p5D, ViTInputSplitter2p5D, ViTTokenFuser2p5D)
 from colossalai.utils import get_current_device
 from colossalai.utils import print_rank_0
 from .common import *
@@ -92,6 +93,38 @@ def check_linear():
     print_rank_0('linear backward: pass')
 
 
+def check_linear_fp16_step():
+    device = get_current_device()
+    dtype = torch.half
+    INPUT_SIZE = HIDDEN_SIZE
+    OUTPUT_SIZE = 2 * HIDDEN_SIZE
+
+    i = gpc.get_local_rank(ParallelMode.PARALLEL_2P5D_COL)
+
+    layer = Linear2p5D(
+        INPUT_SIZE,
+        OUTPUT_SIZE,
+        dtype=dtype,
+        skip_bias_add=False)
+    optimizer = FP16Optimizer(torch.optim.SGD(layer.parameters(), lr=1e-2), initial_scale=2 ** 5)
+    bias = layer.bias.detach().clone()
+
+    A_shape = (BATCH_SIZE // TESSERACT_DIM, SEQ_LENGTH, INPUT_SIZE // TESSERACT_DIM)
+    optimizer.zero_grad()
+    A = torch.randn(A_shape, dtype=dtype, device=device)
+    out = layer(A)
+    optimizer.scale_loss(out.float().sum()).backward()
+    # only row rank 0 holds a gradient for the bias replica
+    assert (layer.bias.grad is not None) == (i == 0)
+    optimizer.step()
+
+    if i == 0:
+        assert not torch.equal(bias, layer.bias)
+    else:
+        assert torch.equal(bias, layer.bias)
+    print_rank_0('linear fp16 optimizer step: pass')
+
+
 def check_layernorm():
     device = get_current_device()
     dtype = torch.float32
@@ -223,6 +256,62 @@ def check_mlp():
     print_rank_0('mlp backward: pass')
 
 
+def check_vit_mlp_fused_gelu():
+    device = get_current_device()
+    dtype = torch.float32
+    INPUT_SIZE = HIDDEN_SIZE
+
+    i = gpc.get_local_rank(ParallelMode.PARALLEL_2P5D_COL)
+    j = gpc.get_local_rank(ParallelMode.PARALLEL_2P5D_ROW)
+
+    layer = ViTMLP2p5D(
+        HIDDEN_SIZE,
+        mlp_ratio=1,
+        act_func='fused_gelu',
+        dropout_prob=0.,
+        dtype=dtype,
+    )
+    # same weights with the erf gelu as reference, the fused tanh approximation
+    # stays well within the tolerance of check_equal
+    layer_ref = ViTMLP2p5D(
+        HIDDEN_SIZE,
+        mlp_ratio=1,
+        act_func='gelu',
+        dropout_prob=0.,
+        dtype=dtype,
+    )
+    layer_ref.load_state_dict(layer.state_dict())
+
+    A_shape = (BATCH_SIZE, SEQ_LENGTH, INPUT_SIZE)
+    A_master = torch.randn(A_shape, dtype=dtype, device=device)
+    torch.distributed.broadcast(A_master, src=0)
+    A = torch.chunk(A_master, TESSERACT_DIM, dim=0)[i]
+    A = torch.chunk(A, TESSERACT_DIM, dim=-1)[j]
+    A = A.clone()
+    A.requires_grad = True
+    B = A.detach().clone()
+    B.requires_grad = True
+
+    out = layer(A)
+    C = layer_ref(B)
+    assert out.shape == (BATCH_SIZE // TESSERACT_DIM, SEQ_LENGTH, INPUT_SIZE // TESSERACT_DIM)
+    check_equal(out, C)
+    print_rank_0('vit mlp fused gelu forward: pass')
+
+    grad_shape = out.shape
+    grad = torch.randn(grad_shape, dtype=dtype, device=device)
+
+    out.backward(grad)
+    C.backward(grad)
+    assert A.grad.shape == A.shape
+    check_equal(A.grad, B.grad)
+    if i == 0:
+        check_equal(layer.dense_1.bias.grad, layer_ref.dense_1.bias.grad)
+    else:
+        assert layer.dense_1.bias.grad is None and layer_ref.dense_1.bias.grad is None
+    print_rank_0('vit mlp fused gelu backward: pass')
+
+
 def check_transformerlayer():
     device = get_current_device()
     dtype = torch.float32
@@ -263,3 +352,84 @@ def check_transformerlayer():
     out.backward(grad)
     assert A.grad.shape == A.shape
     print_rank_0('transformerlayer backward: pass')
+
+
+def check_vit_input_splitter():
+    device = get_current_device()
+    dtype = torch.float32
+
+    i = gpc.get_local_rank(ParallelMode.PARALLEL_2P5D_COL)
+
+    layer = ViTInputSplitter2p5D()
+
+    A_shape = (BATCH_SIZE, SEQ_LENGTH, HIDDEN_SIZE)
+    A_master = torch.randn(A_shape, dtype=dtype, device=device)
+    torch.distributed.broadcast(A_master, src=0)
+    A = torch.chunk(A_master, TESSERACT_DIM, dim=-1)[i]
+    A = A.clone()
+    A.requires_grad = True
+
+    out = layer(A)
+    C = torch.chunk(A_master, TESSERACT_DIM, dim=0)[i]
+    assert out.shape == (BATCH_SIZE // TESSERACT_DIM, SEQ_LENGTH, HIDDEN_SIZE)
+    check_equal(out, C)
+    print_rank_0('vit input splitter forward: pass')
+
+    grad_master = torch.randn(A_shape, dtype=dtype, device=device)
+    torch.distributed.broadcast(grad_master, src=0)
+    grad = torch.chunk(grad_master, TESSERACT_DIM, dim=0)[i]
+    out.backward(grad)
+    A_grad = torch.chunk(grad_master, TESSERACT_DIM, dim=-1)[i]
+    check_equal(A_grad, A.grad)
+    print_rank_0('vit input splitter backward: pass')
+
+
+def check_vit_token_fuser():
+    device = get_current_device()
+    dtype = torch.float32
+    IMG_SIZE = 16
+    PATCH_SIZE = 4
+    EMBED_DIM = TESSERACT_DEP * TESSERACT_DIM ** 2 * HIDDEN_SIZE
+    NUM_PATCHES = (IMG_SIZE // PATCH_SIZE) ** 2
+
+    i = gpc.get_local_rank(ParallelMode.PARALLEL_2P5D_COL)
+
+    layer = ViTTokenFuser2p5D(IMG_SIZE, PATCH_SIZE, EMBED_DIM, drop_rate=0.)
+
+    A_shape = (BATCH_SIZE, NUM_PATCHES, EMBED_DIM // (TESSERACT_DEP * TESSERACT_DIM))
+    A = torch.randn(A_shape, dtype=dtype, device=device)
+    A.requires_grad = True
+    B = A.detach().clone()
+    B.requires_grad = True
+
+    cls_shape = (1, 1, A_shape[-1])
+    cls_master = torch.randn(cls_shape, dtype=dtype, device=device)
+    torch.distributed.broadcast(cls_master, src=0)
+    cls_token = torch.chunk(cls_master, TESSERACT_DIM, dim=-1)[i]
+    layer.cls_token = Parameter(cls_token.clone())
+
+    pos_shape = (1, NUM_PATCHES + 1, A_shape[-1])
+    pos_master = torch.randn(pos_shape, dtype=dtype, device=device)
+    torch.distributed.broadcast(pos_master, src=0)
+    pos_embed = torch.chunk(pos_master, TESSERACT_DIM, dim=-1)[i]
+    layer.pos_embed = Parameter(pos_embed.clone())
+
+    out = layer(A)
+    cls_master = cls_master.clone()
+    cls_master.requires_grad = True
+    pos_master = pos_master.clone()
+    pos_master.requires_grad = True
+    C = torch.cat((cls_master.expand(BATCH_SIZE, -1, -1), B), dim=1) + pos_master
+    assert out.shape == (BATCH_SIZE, NUM_PATCHES + 1, A_shape[-1])
+    check_equal(out, C)
+    print_rank_0('vit token fuser forward: pass')
+
+    grad = torch.randn(out.shape, dtype=dtype, device=device)
+    out.backward(grad)
+    C.backward(grad)
+    check_equal(A.grad, B.grad)
+    cls_grad = torch.chunk(cls_master.grad, TESSERACT_DIM, dim=-1)[i]
+    check_equal(layer.cls_token.grad, cls_grad)
+    pos_grad = torch.chunk(pos_master.grad, TESSERACT_DIM, dim=-1)[i]
+    check_equal(layer.pos_embed.grad, pos_grad)
+    print_rank_0('vit token fuser backward: pass')
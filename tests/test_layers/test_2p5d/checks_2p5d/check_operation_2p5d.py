@@ -3,7 +3,7 @@ import torch
 from colossalai.context import ParallelMode
 from colossalai.core import global_context as gpc
 from colossalai.nn.layer.parallel_2p5d._operation import Matmul_AB_2p5D, Matmul_ABT_2p5D, \
-    Matmul_ATB_2p5D
+    Matmul_ATB_2p5D, AllGatherLast
 from colossalai.utils import get_current_device
 from colossalai.utils import print_rank_0
 from .common import *
@@ -234,3 +234,42 @@ def check_ATB():
     C_grad = torch.chunk(C_grad, TESSERACT_DIM, dim=-1)[j]
     check_equal(C_grad, C.grad)
     print_rank_0('ATB backward: pass')
+
+
+def check_all_gather_last():
+    dtype = torch.float
+    i = gpc.get_local_rank(ParallelMode.PARALLEL_2P5D_COL)
+
+    A_shape = (BATCH_SIZE, SEQ_LENGTH, HIDDEN_SIZE)
+    A_master = torch.randn(A_shape, dtype=dtype, device=get_current_device())
+    torch.distributed.broadcast(A_master, src=0)
+    A_list = torch.chunk(A_master, TESSERACT_DIM, dim=-1)
+    A = A_list[i].clone()
+    A.requires_grad = True
+
+    out = AllGatherLast.apply(A, TESSERACT_DIM, ParallelMode.PARALLEL_2P5D_COL)
+    # the inputs of all column ranks, concatenated along the last dim
+    C = torch.cat(A_list, dim=-1)
+    assert out.shape == C.shape
+    check_equal(out, C)
+    print_rank_0('AllGatherLast forward: pass')
+
+    grad_master = torch.randn(A_shape, dtype=dtype, device=get_current_device())
+    torch.distributed.broadcast(grad_master, src=0)
+    out.backward(grad_master)
+    A_grad = torch.chunk(grad_master, TESSERACT_DIM, dim=-1)[i]
+    check_equal(A_grad, A.grad)
+    print_rank_0('AllGatherLast backward: pass')
+
+    A.grad = None
+    out = AllGatherLast.apply(A, TESSERACT_DIM, ParallelMode.PARALLEL_2P5D_COL, False)
+    # without merge_last the column rank's input stays on its own dim
+    C = torch.stack(A_list, dim=-2)
+    assert out.shape == C.shape
+    check_equal(out, C)
+    print_rank_0('AllGatherLast forward without merge_last: pass')
+
+    out.backward(grad_master.view(C.shape))
+    A_grad = grad_master.view(C.shape)[..., i, :]
+    check_equal(A_grad, A.grad)
+    print_rank_0('AllGatherLast backward without merge_last: pass')
@@ -4,8 +4,9 @@ import torch.multiprocessing as mp
 
 from colossalai.core import global_context as gpc
 from colossalai.initialize import launch
-from checks_2p5d.check_layer_2p5d import check_linear, check_layernorm, check_attention, check_mlp, check_transformerlayer
-from checks_2p5d.check_operation_2p5d import check_AB, check_ABT, check_ATB
+from checks_2p5d.check_layer_2p5d import check_linear, check_linear_fp16_step, check_layernorm, check_attention, check_mlp, check_transformerlayer, \
+    check_vit_mlp_fused_gelu, check_vit_input_splitter, check_vit_token_fuser
+from checks_2p5d.check_operation_2p5d import check_AB, check_ABT, check_ATB, check_all_gather_last
 from functools import partial
 
 
@@ -21,14 +22,19 @@ def check_operations():
     check_AB()
     check_ABT()
     check_ATB()
+    check_all_gather_last()
 
 
 def check_layer():
     check_linear()
+    check_linear_fp16_step()
     check_layernorm()
     check_attention()
     check_mlp()
+    check_vit_mlp_fused_gelu()
     check_transformerlayer()
+    check_vit_input_splitter()
+    check_vit_token_fuser()
 
 
 def check_layer_and_operation(rank, world_size):
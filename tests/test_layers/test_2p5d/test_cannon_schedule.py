@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+import pytest
+
+from colossalai.nn.layer.parallel_2p5d._operation import _cannon_schedule
+
+
+def _shift(tiles, schedule):
+    # every rank (x, y) receives A along its row and B along its column from the
+    # peers named by the schedule, checking that those peers send to it in turn
+    shifted = {}
+    for (x, y) in tiles:
+        (_, _), (src_a, src_b) = schedule(x, y)
+        (dst_a, _), _ = schedule(x, src_a)
+        (_, dst_b), _ = schedule(src_b, y)
+        assert dst_a == y and dst_b == x
+        shifted[(x, y)] = (tiles[(x, src_a)][0], tiles[(src_b, y)][1])
+    return shifted
+
+
+@pytest.mark.cpu
+@pytest.mark.parametrize('tesseract_dim', [1, 2, 3, 4, 5])
+def test_cannon_schedule(tesseract_dim):
+    """
+    Replays the skew and ring shifts of Matmul_AB_2p5D on tile labels: rank (x, y)
+    must multiply A[x, k] @ B[k, y] with k = (x + y + step) % q, so every k exactly once.
+    """
+    grid = [(x, y) for x in range(tesseract_dim) for y in range(tesseract_dim)]
+    tiles = {(x, y): ((x, y), (x, y)) for (x, y) in grid}
+
+    tiles = _shift(tiles, lambda x, y: _cannon_schedule(x, y, tesseract_dim)[0])
+    used_k = {rank: [] for rank in grid}
+    for step in range(tesseract_dim):
+        for (x, y), (a, b) in tiles.items():
+            assert a[0] == x and b[1] == y and a[1] == b[0]
+            assert a[1] == (x + y + step) % tesseract_dim
+            used_k[(x, y)].append(a[1])
+        tiles = _shift(tiles, lambda x, y: _cannon_schedule(x, y, tesseract_dim)[1])
+
+    for k in used_k.values():
+        assert sorted(k) == list(range(tesseract_dim))
+
+
+if __name__ == '__main__':
+    test_cannon_schedule(4)